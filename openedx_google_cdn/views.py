@@ -1,12 +1,17 @@
+import functools
 import json
 import logging
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
 from django.http import HttpResponseNotFound
 from django.utils.translation import gettext as _
-from pytz import UTC
+from google.cloud import storage
+from google.oauth2 import service_account
 from rest_framework import status as rest_status
 from rest_framework.response import Response
 
@@ -29,8 +34,9 @@ from edxval.api import (
     remove_video_for_course,
 )
 from openedx.core.djangoapps.video_config.models import VideoTranscriptEnabledFlag
+from xmodule.contentstore.django import contentstore
 from xmodule.exceptions import NotFoundError
-from xmodule.video_block.transcripts_utils import Transcript
+from xmodule.video_block.transcripts_utils import NON_EXISTENT_TRANSCRIPT, Transcript, subs_filename
 from xmodule.video_block.video_block import VideoBlock
 
 try:
@@ -38,6 +44,11 @@ try:
 except ImportError:
     edxval_api = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 LOGGER = logging.getLogger(__name__)
 
 VIDEO_SUPPORTED_FILE_FORMATS = {
@@ -45,9 +56,36 @@ VIDEO_SUPPORTED_FILE_FORMATS = {
     '.mov': 'video/quicktime',
 }
 
+SUPPORTED_CONTENT_TYPES = frozenset(
+    content_type.lower() for content_type in VIDEO_SUPPORTED_FILE_FORMATS.values()
+)
+
 
 KEY_EXPIRATION_IN_SECONDS = 86400
 
+MAX_SIGNING_WORKERS = 8
+
+
+def _json_dumps(obj):
+    """
+    Serialize `obj` to a compact JSON string, using orjson when it is available.
+
+    The json fallback is configured to produce the same output as orjson, so
+    the result does not depend on whether orjson is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+def _cdn_url_prefix():
+    """
+    Returns the Google CDN URL that uploaded video ids are appended to.
+
+    Read from settings on each call rather than at import so that settings
+    overrides (e.g. in tests) are honoured.
+    """
+    return f"{settings.GOOGLE_CDN_HOST}/{settings.VIDEO_UPLOAD_PIPELINE.get('ROOT_PATH', '')}"
 
 
 def enhanced_handle_videos(prev_fn, request, course_key_string, edx_video_id=None):
@@ -71,10 +109,7 @@ def enhanced_handle_videos(prev_fn, request, course_key_string, edx_video_id=Non
         elif _is_pagination_context_update_request(request):
             return _update_pagination_context(request)
 
-        if getattr(settings, "ENABLE_GOOGLE_CDN", None):
-            data, status = videos_post_cdn(course, request)
-        else:
-            data, status = videos_post(course, request)
+        data, status = _dispatch_videos_post(course, request)
         return JsonResponse(data, status=status)
     
 def custom_video_upload_link_generator(prev_fn, request, course_key_string):
@@ -86,12 +121,20 @@ def custom_video_upload_link_generator(prev_fn, request, course_key_string):
     if not course:
         return Response(data='Course Not Found', status=rest_status.HTTP_400_BAD_REQUEST)
 
-    if getattr(settings, "ENABLE_GOOGLE_CDN", None):
-        data, status = videos_post_cdn(course, request)
-    else:
-        data, status = videos_post(course, request)
+    data, status = _dispatch_videos_post(course, request)
     return Response(data, status=status)
 
+
+def _dispatch_videos_post(course, request):
+    """
+    Handles a video upload request with the Google CDN flow when it is enabled,
+    or with the platform's default `videos_post` otherwise.
+    """
+    if getattr(settings, "ENABLE_GOOGLE_CDN", None):
+        return videos_post_cdn(course, request)
+    return videos_post(course, request)
+
+
 def videos_post_cdn(course, request):
     """
     Input (JSON):
@@ -110,123 +153,145 @@ def videos_post_cdn(course, request):
     }
     The returned array corresponds exactly to the input array.
     """
-    error = None
     data = request.json
     if 'files' not in data:
-        error = "Request object is not JSON or does not contain 'files'"
-    elif any(
-        'file_name' not in file or 'content_type' not in file
-        for file in data['files']
-    ):
-        error = "Request 'files' entry does not contain 'file_name' and 'content_type'"
-    elif any(
-        file['content_type'] not in list(VIDEO_SUPPORTED_FILE_FORMATS.values())
-        for file in data['files']
-    ):
-        error = "Request 'files' entry contain unsupported content_type"
-
-    if error:
-        return {'error': error}, 400
+        return {'error': "Request object is not JSON or does not contain 'files'"}, 400
 
-    bucket = cdn_storage_service_bucket()
-    req_files = data['files']
-    resp_files = []
+    # Validate every file before doing any storage or course lookups.
+    valid_files = []
+    for req_file in data['files']:
+        if 'file_name' not in req_file or 'content_type' not in req_file:
+            return {'error': "Request 'files' entry does not contain 'file_name' and 'content_type'"}, 400
 
-    for req_file in req_files:
         file_name = req_file['file_name']
+        content_type = req_file['content_type']
+
+        if not isinstance(content_type, str) or content_type.lower() not in SUPPORTED_CONTENT_TYPES:
+            return {'error': "Request 'files' entry contain unsupported content_type"}, 400
 
-        try:
-            file_name.encode('ascii')
-        except UnicodeEncodeError:
+        if not isinstance(file_name, str) or not file_name.isascii():
             error_msg = 'The file name for %s must contain only ASCII characters.' % file_name
             return {'error': error_msg}, 400
 
-        edx_video_id = str(uuid4())
+        valid_files.append((file_name, content_type))
+
+    bucket = cdn_storage_service_bucket()
+    resp_files = []
+
+    # These are course-scoped, so compute them once rather than per file.
+    course_id_str = str(course.id)
+    url_prefix = _cdn_url_prefix()
+
+    course_metadata = {'course_key': course_id_str}
+    is_video_transcript_enabled = VideoTranscriptEnabledFlag.feature_enabled(course.id)
+    if is_video_transcript_enabled:
+        transcript_preferences = get_transcript_preferences(course_id_str)
+        if transcript_preferences is not None:
+            course_metadata['transcript_preferences'] = _json_dumps(transcript_preferences)
+
+    uploads = []
+    for file_name, content_type in valid_files:
+        edx_video_id = uuid4().hex
 
         cdn_key = cdn_storage_service_key(bucket, file_name=edx_video_id)
 
-        metadata_list = [
-            ('client_video_id', file_name),
-            ('course_key', str(course.id)),
-        ]
-
-        is_video_transcript_enabled = VideoTranscriptEnabledFlag.feature_enabled(course.id)
-        if is_video_transcript_enabled:
-            transcript_preferences = get_transcript_preferences(str(course.id))
-            if transcript_preferences is not None:
-                metadata_list.append(('transcript_preferences', json.dumps(transcript_preferences)))
-
-        metadata = {}
-        for metadata_name, value in metadata_list:
-            metadata[metadata_name] = value
-
-        cdn_key.metadata = metadata
-
-        upload_url = cdn_key.generate_signed_url(
-            version="v4",
-            expiration=KEY_EXPIRATION_IN_SECONDS,
-            method="PUT",
-            content_type=req_file['content_type'],
-        )
-        
-        if getattr(settings, "ENABLE_GOOGLE_CDN", None):
-            source_url = "{}/{}/{}".format(
-                settings.GOOGLE_CDN_HOST,
-                settings.VIDEO_UPLOAD_PIPELINE.get("ROOT_PATH", ""),
-                edx_video_id
-            )
-        else:
-            source_url = None
-
-        # persist edx_video_id in VAL
-        create_video({
-            'edx_video_id': edx_video_id,
-            'status': 'upload',
-            'client_video_id': file_name,
-            'duration': 0,
-            'encoded_videos': [],
-            'courses': [str(course.id)],
-            'html5_sources': [source_url] if source_url else []
-        })
-
-        resp_files.append({'file_name': file_name, 'upload_url': upload_url, 'edx_video_id': edx_video_id})
+        cdn_key.metadata = {'client_video_id': file_name, **course_metadata}
+
+        uploads.append((file_name, edx_video_id, cdn_key, content_type))
+
+    def _sign(upload):
+        __, __, cdn_key, content_type = upload
+        return _generate_upload_url(cdn_key, content_type)
+
+    # Signing is independent per file, so sign real batches concurrently; a
+    # single file is cheaper to sign inline than to hand to a thread pool.
+    if len(uploads) <= 1:
+        upload_urls = [_sign(upload) for upload in uploads]
+    else:
+        with ThreadPoolExecutor(max_workers=min(MAX_SIGNING_WORKERS, len(uploads))) as executor:
+            upload_urls = list(executor.map(_sign, uploads))
+
+    # Persist all of the batch's videos in a single transaction.
+    with transaction.atomic():
+        for (file_name, edx_video_id, __, __), upload_url in zip(uploads, upload_urls):
+            source_url = f"{url_prefix}/{edx_video_id}"
+
+            # persist edx_video_id in VAL
+            create_video({
+                'edx_video_id': edx_video_id,
+                'status': 'upload',
+                'client_video_id': file_name,
+                'duration': 0,
+                'encoded_videos': [],
+                'courses': [course_id_str],
+                'html5_sources': [source_url]
+            })
+
+            resp_files.append({'file_name': file_name, 'upload_url': upload_url, 'edx_video_id': edx_video_id})
 
     return {'files': resp_files}, 200
 
 
+@functools.lru_cache(maxsize=1)
 def cdn_storage_service_bucket():
-    """Generates a v4 signed URL for uploading a blob using HTTP PUT.
-    Note that this method requires a service account key file. You can not use
-    this if you are using Application Default Credentials from Google Compute
-    Engine or from the Google Cloud SDK.
+    """
+    Returns the `GOOGLE_CDN_BUCKET` bucket, authenticated with the service
+    account in `GOOGLE_CDN_CREDENTIALS`.
+
+    The client and bucket are built once per process and reused; the cache is
+    cleared when either setting is overridden (see `_reset_cdn_storage_caches`).
     """
 
     bucket_name = settings.GOOGLE_CDN_BUCKET
-    credentials = settings.GOOGLE_CDN_CREDENTIALS
-    
-    # Convert the dictionary to a JSON-formatted string
-    credentials_json = json.dumps(credentials)
+    credentials = cdn_signing_credentials()
 
-    temp_file = tempfile.NamedTemporaryFile(mode='w+', delete=False)
+    storage_client = storage.Client(project=credentials.project_id, credentials=credentials)
+    return storage_client.bucket(bucket_name)
 
-    # Write the JSON string to the temporary file
-    temp_file.write(credentials_json)
 
-    # Close the file before passing its path to the function
-    temp_file.close()
-    # Use the temporary file path in your function
-    storage_client = storage.Client.from_service_account_json(temp_file.name)
-    return storage_client.bucket(bucket_name)
+@functools.lru_cache(maxsize=1)
+def cdn_signing_credentials():
+    """
+    Returns the service account credentials used for the CDN bucket.
+
+    Parsing the private key is expensive, so it is done once per process and
+    the credentials are shared by the storage client and URL signing. The
+    cache is cleared when the setting is overridden (see
+    `_reset_cdn_storage_caches`).
+    """
+    return service_account.Credentials.from_service_account_info(settings.GOOGLE_CDN_CREDENTIALS)
+
+
+@receiver(setting_changed)
+def _reset_cdn_storage_caches(setting, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drops the cached CDN bucket and credentials when their settings change,
+    e.g. with `override_settings` in tests.
+    """
+    if setting in ('GOOGLE_CDN_BUCKET', 'GOOGLE_CDN_CREDENTIALS'):
+        cdn_storage_service_bucket.cache_clear()
+    if setting == 'GOOGLE_CDN_CREDENTIALS':
+        cdn_signing_credentials.cache_clear()
+
+
+def _generate_upload_url(cdn_key, content_type):
+    """
+    Returns a v4 signed URL that can be used to PUT the given blob.
+    """
+    return cdn_key.generate_signed_url(
+        version="v4",
+        expiration=KEY_EXPIRATION_IN_SECONDS,
+        method="PUT",
+        content_type=content_type,
+        credentials=cdn_signing_credentials(),
+    )
 
 
 def cdn_storage_service_key(bucket, file_name):
     """
     Returns an S3 key to the given file in the given bucket.
     """
-    key_name = "{}/{}".format(
-        settings.VIDEO_UPLOAD_PIPELINE.get("ROOT_PATH", ""),
-        file_name
-    )
+    key_name = f"{settings.VIDEO_UPLOAD_PIPELINE.get('ROOT_PATH', '')}/{file_name}"
     return bucket.blob(key_name)
 
 
@@ -243,8 +308,16 @@ class CustomVideoBlock(VideoBlock):
         if not metadata_was_changed_by_user and self.sub and hasattr(self, 'html5_sources'):
             html5_ids = self.get_html5_ids(self.html5_sources)
             for subs_id in html5_ids:
+                # Same lookup as `Transcript.asset`, but only existence matters
+                # here, so open the asset as a stream instead of reading it.
+                if subs_id == NON_EXISTENT_TRANSCRIPT:
+                    metadata_was_changed_by_user = True
+                    break
                 try:
-                    Transcript.asset(self.location, subs_id)
+                    contentstore().find(
+                        Transcript.asset_location(self.location, subs_filename(subs_id)),
+                        as_stream=True,
+                    )
                 except NotFoundError:
                     metadata_was_changed_by_user = True
                     break
@@ -254,11 +327,7 @@ class CustomVideoBlock(VideoBlock):
 
             # Custom SDAIA Feature: Set source URL to Google CDN if sub is None
             if self.edx_video_id and not self.sub and getattr(settings, "ENABLE_GOOGLE_CDN", None):
-                source_url = "{}/{}/{}".format(
-                    settings.GOOGLE_CDN_HOST,
-                    settings.VIDEO_UPLOAD_PIPELINE.get("ROOT_PATH", ""),
-                    self.edx_video_id
-                )
+                source_url = f"{_cdn_url_prefix()}/{self.edx_video_id}"
                 self.html5_sources = [source_url]
 
             # Logic for overriding `youtube_id_1_0` with val youtube profile